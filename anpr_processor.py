@@ -1,13 +1,14 @@
 import cv2
 import numpy as np
-import easyocr
-from ultralytics import YOLO
 import os
 from PIL import Image
-import re
+from plate_fusion import PlateVoter, merge_fragments, normalize_plate
 
 class ANPRProcessor:
-    def __init__(self):
+    def __init__(self, motion_gate_factory=None, watchlist=None):
+        # Imported here so that importing this module does not pull in torch
+        from ultralytics import YOLO
+        
         # Load YOLO model for number plate detection
         model_path = os.path.join(os.path.dirname(__file__), "ANPR_Model_Full", "weights", "best.pt")
         self.yolo_model = YOLO(model_path)
@@ -15,11 +16,23 @@ class ANPRProcessor:
         # Don't initialize EasyOCR immediately - delay until needed
         self.reader = None
         self.ocr_available = None  # None = not yet tried, True/False = result
+        
+        # Fuses repeated reads of the same tracked plate
+        self.plate_voter = PlateVoter()
+        
+        # Optional callable returning a new MotionGate; process_frame keeps one gate
+        # per frame source so frames from different cameras are never diffed together
+        self.motion_gate_factory = motion_gate_factory
+        self.motion_gates = {}  # source -> MotionGate
+        
+        # Optional Watchlist checked on every plate read
+        self.watchlist = watchlist
     
     def _init_ocr(self):
         """Initialize EasyOCR reader only when needed"""
         if self.ocr_available is None:  # Only try once
             try:
+                import easyocr
                 self.reader = easyocr.Reader(['en'])
                 self.ocr_available = True
                 print("✅ EasyOCR initialized successfully!")
@@ -38,6 +51,13 @@ class ANPRProcessor:
         if original_image is None:
             raise ValueError("Could not read image")
         
+        return self.detect_plate_in_frame(original_image)
+    
+    def detect_plate_in_frame(self, original_image) -> tuple:
+        """
+        Detect number plate in an already decoded BGR frame and crop it
+        Returns: (cropped_image, original_image_with_bbox)
+        """
         # Run YOLO detection
         results = self.yolo_model(original_image)
         
@@ -55,23 +75,23 @@ class ANPRProcessor:
             cv2.putText(image_with_bbox, "Number Plate", (x1, y1-10), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
             
-            # Crop the number plate
-            cropped_plate = original_image[y1:y2, x1:x2]
+            # Crop the number plate (copied so it stays valid if the frame buffer is reused)
+            cropped_plate = original_image[y1:y2, x1:x2].copy()
             
             return cropped_plate, image_with_bbox
         else:
             raise ValueError("No number plate detected in the image")
     
-    def extract_text_from_plate(self, plate_image) -> str:
+    def read_plate(self, plate_image) -> tuple:
         """
-        Extract text from cropped number plate using EasyOCR
-        Returns: cleaned number plate text (no spaces)
+        Run EasyOCR on a cropped plate and merge all fragments in reading order
+        Returns: (merged_text, per_character_confidences), or None if OCR is unavailable
         """
         # Initialize OCR only when needed
         self._init_ocr()
         
         if not self.ocr_available:
-            return "OCR_UNAVAILABLE"
+            return None
         
         # Convert BGR to RGB for EasyOCR
         if len(plate_image.shape) == 3:
@@ -82,42 +102,180 @@ class ANPRProcessor:
         # Use EasyOCR to extract text
         results = self.reader.readtext(plate_rgb)
         
-        if not results:
-            return ""
-        
-        # Get the text with highest confidence
-        best_result = max(results, key=lambda x: x[2])
-        extracted_text = best_result[1]
-        
-        # Clean the text: remove spaces and convert to uppercase
-        cleaned_text = re.sub(r'[^A-Z0-9]', '', extracted_text.upper())
-        
-        return cleaned_text
+        # Two-line plates come back as separate fragments, so keep all of them
+        return merge_fragments(results)
+    
+    def extract_text_from_plate(self, plate_image) -> str:
+        """
+        Extract text from cropped number plate using EasyOCR
+        Returns: cleaned number plate text (no spaces)
+        """
+        return self._normalize_read(self.read_plate(plate_image))[0]
+    
+    def _normalize_read(self, read) -> tuple:
+        """
+        Fix letter/digit confusions against Indian plate formats
+        Returns: (number_plate, plate_valid)
+        """
+        if read is None:
+            return "OCR_UNAVAILABLE", False
+        return normalize_plate(read[0])
+    
+    def _check_watchlist(self, result: dict, source=None, track_id=None):
+        """Attach a watchlist alert to a successful result if the plate has complaints"""
+        if self.watchlist is None:
+            return
+        # A voted plate is far less noisy than a single-frame read
+        voted_plate = result.get("voted_plate")
+        number_plate = voted_plate["number_plate"] if voted_plate else result["number_plate"]
+        result["watchlist_alert"] = self.watchlist.check_read(number_plate, source, track_id)
     
     def process_image(self, image_path: str) -> dict:
         """
         Complete ANPR processing: detect, crop, and extract text
-        Returns: dict with number_plate, bbox_image, and cropped_plate
+        Returns: dict with number_plate, bbox_image, cropped_plate and watchlist_alert if enabled
         """
         try:
             # Detect and crop number plate
             cropped_plate, bbox_image = self.detect_and_crop_plate(image_path)
             
             # Extract text from cropped plate
-            number_plate = self.extract_text_from_plate(cropped_plate)
+            number_plate, plate_valid = self._normalize_read(self.read_plate(cropped_plate))
             
+            result = {
+                "success": True,
+                "number_plate": number_plate,
+                "plate_valid": plate_valid,
+                "bbox_image": bbox_image,
+                "cropped_plate": cropped_plate
+            }
+            self._check_watchlist(result, image_path)
+            return result
+        except Exception as e:
             return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _motion_gate_for(self, source):
+        """Get the motion gate for a frame source, creating it on first use"""
+        if self.motion_gate_factory is None:
+            return None
+        if source not in self.motion_gates:
+            self.motion_gates[source] = self.motion_gate_factory()
+        return self.motion_gates[source]
+    
+    def process_frame(self, frame, track_id=None, source=None) -> dict:
+        """
+        Complete ANPR processing on an already decoded BGR frame
+        If track_id is given, the read is also voted with earlier reads of that track
+        source identifies the camera/video, so each one gets its own motion gate
+        Returns: dict with number_plate, bbox_image, cropped_plate and optionally voted_plate
+        """
+        try:
+            # Skip detection entirely when nothing moved in the region of interest
+            motion_gate = self._motion_gate_for(source)
+            if motion_gate is not None and not motion_gate.should_detect(frame):
+                return {
+                    "success": False,
+                    "skipped": True,
+                    "error": "No motion in region of interest"
+                }
+            
+            cropped_plate, bbox_image = self.detect_plate_in_frame(frame)
+            read = self.read_plate(cropped_plate)
+            number_plate, plate_valid = self._normalize_read(read)
+            
+            result = {
                 "success": True,
                 "number_plate": number_plate,
+                "plate_valid": plate_valid,
                 "bbox_image": bbox_image,
                 "cropped_plate": cropped_plate
             }
+            if read and track_id is not None:
+                self.plate_voter.add_read(track_id, *read)
+                result["voted_plate"] = self.plate_voter.vote(track_id)
+            self._check_watchlist(result, source, track_id)
+            return result
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    def get_motion_stats(self) -> dict:
+        """Skip and pass counts per frame source, or None if gating is off"""
+        if self.motion_gate_factory is None:
+            return None
+        return {source: gate.stats() for source, gate in self.motion_gates.items()}
+    
+    def publish_image(self, image_path: str, frame_ring, frame_queue) -> dict:
+        """
+        Decode an image into a shared frame ring slot and queue its reference
+        Returns: the frame reference dict that was queued
+        """
+        image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError("Could not read image")
+        
+        frame_ref = frame_ring.write(image, source=image_path, frame_index=0)
+        frame_queue.put(frame_ref)
+        return frame_ref
+    
+    def publish_video(self, video_path: str, frame_ring, frame_queue, frame_step: int = 1) -> int:
+        """
+        Decode a video into shared frame ring slots, queueing every frame_step-th frame
+        Returns: number of frames published
+        """
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            raise ValueError("Could not open video")
+        
+        published = 0
+        frame_index = 0
+        try:
+            while True:
+                # grab() skips decoding of frames we are not going to publish
+                if not capture.grab():
+                    break
+                if frame_index % frame_step == 0:
+                    ok, frame = capture.retrieve()
+                    if not ok:
+                        break
+                    frame_queue.put(frame_ring.write(frame, source=video_path, frame_index=frame_index))
+                    published += 1
+                frame_index += 1
+        finally:
+            capture.release()
+        
+        return published
+    
+    def process_shared_frame(self, frame_ring, frame_ref: dict) -> dict:
+        """
+        Run ANPR on a frame held in a shared frame ring and release its slot
+        Returns: process_frame result plus the frame metadata
+        """
+        # An invalid reference never owned a slot, so there is nothing to release
+        try:
+            frame = frame_ring.read(frame_ref)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "frame_ref": frame_ref
+            }
+        
+        try:
+            result = self.process_frame(frame, frame_ref.get("track_id"), frame_ref.get("source"))
+            # Drop the view before the slot can be overwritten
+            del frame
+        finally:
+            frame_ring.release(frame_ref)
+        
+        result["frame_ref"] = frame_ref
+        return result
+    
     def convert_cv2_to_pil(self, cv2_image):
         """Convert OpenCV image to PIL Image for Streamlit display"""
         cv2_image_rgb = cv2.cvtColor(cv2_image, cv2.COLOR_BGR2RGB)
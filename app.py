@@ -3,16 +3,18 @@ import pandas as pd
 from datetime import datetime
 import tempfile
 import os
-import torch
 import logging
 # try:
 #     from database import db_manager
 #     print("✅ Using MongoDB database")
 # except Exception as e:
 #     print(f"❌ MongoDB failed, using simple database: {e}")
+# from sharded_database import db_manager  # Sharded JSON database for large histories
+# from sqlite_database import db_manager  # SQLite (WAL) database, safe for concurrent sessions
 from simple_database import db_manager
 print("✅ Using simple JSON database")
-from anpr_processor import ANPRProcessor
+from evidence_store import evidence_store
+from watchlist import Watchlist
 
 # Configure page with modern styling
 st.set_page_config(
@@ -91,18 +93,6 @@ st.markdown("""
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Apply PyTorch patch before any model loading
-original_torch_load = torch.load
-
-def patched_torch_load(f, *args, **kwargs):
-    # If weights_only is not specified and this looks like a YOLO model, set weights_only=False
-    if 'weights_only' not in kwargs and isinstance(f, str) and f.endswith('.pt'):
-        kwargs['weights_only'] = False
-    return original_torch_load(f, *args, **kwargs)
-
-# Apply the patch
-torch.load = patched_torch_load
-
 # Initialize session state
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
@@ -111,12 +101,35 @@ if 'username' not in st.session_state:
 if 'user_type' not in st.session_state:
     st.session_state.user_type = None
 
-# Initialize ANPR processor
+# Watchlist of plates with complaints, kept current as complaints are added.
+# Built on first ANPR use, since indexing reads every vehicle in the database.
 @st.cache_resource
-def load_anpr_processor():
-    return ANPRProcessor()
+def load_watchlist():
+    watchlist = Watchlist()
+    watchlist.load_from(db_manager)
+    watchlist.attach(db_manager)
+    return watchlist
 
-anpr_processor = load_anpr_processor()
+# Initialize ANPR processor only when the ANPR path is used, so that torch,
+# ultralytics and easyocr are not imported for login, viewer and admin pages
+@st.cache_resource
+def load_anpr_processor():
+    import torch
+    from anpr_processor import ANPRProcessor
+    
+    # Apply PyTorch patch before any model loading
+    original_torch_load = torch.load
+    
+    def patched_torch_load(f, *args, **kwargs):
+        # If weights_only is not specified and this looks like a YOLO model, set weights_only=False
+        if 'weights_only' not in kwargs and isinstance(f, str) and f.endswith('.pt'):
+            kwargs['weights_only'] = False
+        return original_torch_load(f, *args, **kwargs)
+    
+    # Apply the patch
+    torch.load = patched_torch_load
+    
+    return ANPRProcessor(watchlist=load_watchlist())
 
 def login_page():
     # Modern header
@@ -175,6 +188,25 @@ def login_page():
         
         st.markdown('</div>', unsafe_allow_html=True)
 
+def show_complaint_evidence(complaints):
+    """Show stored evidence images for complaints that reference them"""
+    for complaint in complaints:
+        evidence = complaint.get('evidence')
+        if not evidence:
+            continue
+        
+        with st.expander(f"Evidence: {complaint['complaint'][:50]}"):
+            col1, col2 = st.columns(2)
+            # Images are only read from the evidence store when rendered
+            plate_image = evidence_store.load_image(evidence.get('plate_crop', ''))
+            frame_image = evidence_store.load_image(evidence.get('annotated_frame', ''))
+            if frame_image is not None:
+                col1.image(frame_image, channels="BGR", caption="Image with Detection", use_column_width=True)
+            if plate_image is not None:
+                col2.image(plate_image, channels="BGR", caption="Cropped Number Plate", use_column_width=True)
+            if frame_image is None and plate_image is None:
+                st.info("Evidence images are no longer available")
+
 def viewer_dashboard():
     # Modern header with user info
     st.markdown(f'<div class="main-header">Welcome, {st.session_state.username}</div>', unsafe_allow_html=True)
@@ -202,6 +234,7 @@ def viewer_dashboard():
                     if vehicle_data.get('complaints'):
                         complaints_df = pd.DataFrame(vehicle_data['complaints'])
                         complaints_df['timestamp'] = pd.to_datetime(complaints_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+                        complaints_df = complaints_df.drop(columns=['evidence'], errors='ignore')
                         complaints_df = complaints_df.rename(columns={
                             'complaint': 'Complaint',
                             'timestamp': 'Date & Time'
@@ -214,6 +247,7 @@ def viewer_dashboard():
                         st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
                         st.dataframe(complaints_df, use_container_width=True)
                         st.markdown('</div>', unsafe_allow_html=True)
+                        show_complaint_evidence(vehicle_data['complaints'])
                     else:
                         st.info("No complaints found for this vehicle")
                 else:
@@ -223,9 +257,13 @@ def viewer_dashboard():
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def register_complaint_with_feedback(number_plate, complaint_text):
+def clear_evidence():
+    """Forget evidence from the previous upload so it is not attached to a new complaint"""
+    st.session_state.evidence_refs = None
+
+def register_complaint_with_feedback(number_plate, complaint_text, evidence=None):
     """Helper function to register complaint and show feedback"""
-    if db_manager.add_vehicle_complaint(number_plate, complaint_text):
+    if db_manager.add_vehicle_complaint(number_plate, complaint_text, evidence):
         st.success("Complaint registered successfully!")
         logger.debug("Complaint registered successfully!")
         
@@ -237,6 +275,7 @@ def register_complaint_with_feedback(number_plate, complaint_text):
         if vehicle_data and vehicle_data.get('complaints'):
             complaints_df = pd.DataFrame(vehicle_data['complaints'])
             complaints_df['timestamp'] = pd.to_datetime(complaints_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            complaints_df = complaints_df.drop(columns=['evidence'], errors='ignore')
             complaints_df = complaints_df.rename(columns={
                 'complaint': 'Complaint',
                 'timestamp': 'Date & Time'
@@ -268,7 +307,8 @@ def uploader_dashboard():
         
         uploaded_file = st.file_uploader("Choose a vehicle image", 
                                        type=['jpg', 'jpeg', 'png', 'bmp'],
-                                       help="Upload an image containing a vehicle number plate")
+                                       help="Upload an image containing a vehicle number plate",
+                                       on_change=clear_evidence)
         
         if uploaded_file is not None:
             # Display uploaded image in a styled container
@@ -287,11 +327,19 @@ def uploader_dashboard():
                         
                         try:
                             # Process with ANPR
+                            anpr_processor = load_anpr_processor()
                             result = anpr_processor.process_image(tmp_file_path)
                             
                             if result['success']:
                                 st.markdown('<div class="success-message">Image processed successfully!</div>', unsafe_allow_html=True)
                                 
+                                # Keep only hash references in the session, not the images
+                                try:
+                                    st.session_state.evidence_refs = evidence_store.save_anpr_result(result)
+                                except Exception as e:
+                                    logger.error(f"Failed to store evidence: {e}")
+                                    st.session_state.evidence_refs = None
+                                
                                 # Display results in columns
                                 col1, col2 = st.columns(2)
                                 
@@ -311,10 +359,13 @@ def uploader_dashboard():
                                 if result['number_plate'] == "OCR_UNAVAILABLE":
                                     st.warning("OCR is currently unavailable due to network issues. Please manually enter the number plate below.")
                                     st.session_state.has_cropped_plate = True
-                                    st.session_state.cropped_plate_image = result['cropped_plate']
                                     st.session_state.extracted_plate = None
                                 else:
                                     st.success(f"Extracted Number Plate: {result['number_plate']}")
+                                    if not result.get('plate_valid', True):
+                                        st.warning("The extracted text does not look like a valid number plate. Please check it before registering.")
+                                    if result.get('watchlist_alert'):
+                                        st.warning(f"This vehicle already has {result['watchlist_alert']['complaints']} complaint(s) on record")
                                     st.session_state.extracted_plate = result['number_plate']
                                     st.session_state.has_cropped_plate = True
                                 
@@ -324,6 +375,7 @@ def uploader_dashboard():
                                 elif st.session_state.get('has_cropped_plate', False):
                                     st.info("Image processed successfully. Please enter the number plate and register your complaint below")
                             else:
+                                st.session_state.evidence_refs = None
                                 st.error(f"Failed to process image: {result['error']}")
                         
                         finally:
@@ -353,10 +405,14 @@ def uploader_dashboard():
         with col2:
             if st.button("Register Complaint", key="register_manual", use_container_width=True):
                 if manual_plate and manual_complaint:
-                    if register_complaint_with_feedback(manual_plate, manual_complaint):
+                    # Evidence belongs to the current upload, whatever plate the uploader confirms
+                    if register_complaint_with_feedback(manual_plate, manual_complaint,
+                                                        st.session_state.get('evidence_refs')):
+                        st.session_state.evidence_refs = None
                         if st.button("Start New Upload", key="start_over_manual", use_container_width=True):
                             st.session_state.extracted_plate = None
                             st.session_state.has_cropped_plate = False
+                            st.session_state.evidence_refs = None
                             st.rerun()
                 else:
                     st.error("Please enter both number plate and complaint")
@@ -459,6 +515,7 @@ def admin_dashboard():
                     if selected_vehicle.get('complaints'):
                         complaints_df = pd.DataFrame(selected_vehicle['complaints'])
                         complaints_df['timestamp'] = pd.to_datetime(complaints_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+                        complaints_df = complaints_df.drop(columns=['evidence'], errors='ignore')
                         complaints_df = complaints_df.rename(columns={
                             'complaint': 'Complaint',
                             'timestamp': 'Date & Time'
@@ -468,6 +525,7 @@ def admin_dashboard():
                         st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
                         st.dataframe(complaints_df, use_container_width=True)
                         st.markdown('</div>', unsafe_allow_html=True)
+                        show_complaint_evidence(selected_vehicle['complaints'])
                     else:
                         st.info("No complaints for this vehicle")
                     
@@ -0,0 +1,116 @@
+"""
+Startup benchmark: measure import time per module in a fresh interpreter.
+
+Usage:
+    python benchmark_startup.py                 # default module list
+    python benchmark_startup.py torch cv2       # specific modules
+    python benchmark_startup.py --detail anpr_processor
+"""
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MODULES = [
+    "streamlit",
+    "pandas",
+    "numpy",
+    "cv2",
+    "torch",
+    "ultralytics",
+    "easyocr",
+    "simple_database",
+    "sharded_database",
+    "evidence_store",
+    "anpr_processor",
+]
+
+def app_startup_modules() -> list:
+    """
+    Modules app.py imports at module level; these decide login/viewer page latency
+    Imports inside functions (e.g. the lazy ANPR stack) are not included
+    """
+    with open(os.path.join(REPO_DIR, "app.py"), 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name for name in names if name not in modules)
+    return modules
+
+def _run_python(args: list) -> subprocess.CompletedProcess:
+    """
+    Run a fresh interpreter in a temporary directory with the repo on the path,
+    so module-level database/evidence instances do not create files in the repo
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        return subprocess.run([sys.executable] + args, capture_output=True, text=True,
+                              cwd=tmp_dir, env=env)
+
+def measure_import(modules: list, repeats: int = 3) -> float:
+    """
+    Import modules in a fresh interpreter and return the best wall time in seconds
+    Returns None if any module cannot be imported
+    """
+    code = (
+        "import time; t = time.perf_counter(); "
+        + "; ".join(f"import {m}" for m in modules)
+        + "; print(time.perf_counter() - t)"
+    )
+    best = None
+    for _ in range(repeats):
+        proc = _run_python(["-c", code])
+        if proc.returncode != 0:
+            return None
+        elapsed = float(proc.stdout.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def import_time_detail(module: str, top: int = 15) -> list:
+    """
+    Run python -X importtime and return the slowest (cumulative_us, name) entries
+    """
+    proc = _run_python(["-X", "importtime", "-c", f"import {module}"])
+    entries = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        entries.append((int(parts[1].strip()), parts[2].rstrip()))
+    return sorted(entries, reverse=True)[:top]
+
+def main(argv: list):
+    if argv and argv[0] == "--detail":
+        for module in argv[1:] or ["anpr_processor"]:
+            print(f"\nSlowest imports under {module}:")
+            for cumulative_us, name in import_time_detail(module):
+                print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+        return
+
+    startup_modules = app_startup_modules()
+    groups = [(m, [m]) for m in (argv or DEFAULT_MODULES)]
+    groups.append(("app startup (" + ", ".join(startup_modules) + ")", startup_modules))
+
+    print(f"{'module':<60} {'import time':>12}")
+    print("-" * 73)
+    for label, modules in groups:
+        elapsed = measure_import(modules)
+        result = "not available" if elapsed is None else f"{elapsed * 1000:9.1f} ms"
+        print(f"{label:<60} {result:>12}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -45,20 +45,24 @@ class DatabaseManager:
         user = self.users_collection.find_one({"username": username})
         return user
     
-    def add_vehicle_complaint(self, number_plate: str, complaint: str) -> bool:
-        """Add a complaint to a vehicle's record"""
+    def add_vehicle_complaint(self, number_plate: str, complaint: str, evidence: Optional[Dict] = None) -> bool:
+        """Add a complaint to a vehicle's record, optionally with evidence hash references"""
         # Remove spaces from number plate
         clean_plate = number_plate.replace(" ", "")
         
+        complaint_doc = {
+            "complaint": complaint,
+            "timestamp": datetime.now()
+        }
+        if evidence:
+            complaint_doc["evidence"] = evidence
+        
         # Update or create vehicle record
         result = self.vehicles_collection.update_one(
             {"number_plate": clean_plate},
             {
                 "$push": {
-                    "complaints": {
-                        "complaint": complaint,
-                        "timestamp": datetime.now()
-                    }
+                    "complaints": complaint_doc
                 },
                 "$setOnInsert": {
                     "number_plate": clean_plate,
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import tempfile
+from typing import Dict, Optional
+
+import cv2
+
+class EvidenceStore:
+    """Content-addressed store for plate crops and annotated frames.
+
+    Images are saved once under the hash of their pixels, so identical uploads map to
+    the same files. Complaint records only keep the returned hash references.
+    """
+
+    def __init__(self, base_dir: str = "evidence", image_format: str = "webp", quality: int = 80,
+                 max_frame_side: int = 1280):
+        self.base_dir = base_dir
+        self.image_format = image_format
+        self.quality = quality
+        self.max_frame_side = max_frame_side
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _hash_image(self, image) -> str:
+        """Hash the raw pixels together with the shape"""
+        digest = hashlib.sha256()
+        digest.update(str(image.shape).encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def _path_for(self, ref: str, ext: str) -> str:
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.base_dir, ref[:2], f"{ref}.{ext}")
+
+    def _encode(self, image) -> tuple:
+        """Encode as WebP, falling back to JPEG if the OpenCV build lacks WebP"""
+        if self.image_format == "webp":
+            ok, buffer = cv2.imencode(".webp", image, [cv2.IMWRITE_WEBP_QUALITY, self.quality])
+            if ok:
+                return "webp", buffer
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError("Could not encode evidence image")
+        return "jpg", buffer
+
+    def _downscale(self, image, max_side: Optional[int]):
+        """Shrink image so its longest side is at most max_side"""
+        if not max_side:
+            return image
+        height, width = image.shape[:2]
+        scale = max_side / max(height, width)
+        if scale >= 1:
+            return image
+        return cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+    def find(self, ref: str) -> Optional[str]:
+        """Get the file path of a stored image, or None if missing"""
+        for ext in ("webp", "jpg"):
+            path = self._path_for(ref, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def save_image(self, image, max_side: Optional[int] = None) -> str:
+        """
+        Store an OpenCV image, skipping the write if it is already present
+        Returns: hash reference of the stored image
+        """
+        image = self._downscale(image, max_side)
+        ref = self._hash_image(image)
+        if self.find(ref):
+            return ref
+
+        ext, buffer = self._encode(image)
+        path = self._path_for(ref, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a unique temp file first so readers never see a partial image
+        # and concurrent writers of the same image never share a file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(buffer.tobytes())
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another writer may have published the same content-addressed file
+            if not os.path.exists(path):
+                raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return ref
+
+    def save_anpr_result(self, result: dict) -> Dict:
+        """
+        Store the cropped plate and a downscaled annotated frame from process_image
+        Returns: dict of hash references to keep on the complaint record
+        """
+        return {
+            "plate_crop": self.save_image(result["cropped_plate"]),
+            "annotated_frame": self.save_image(result["bbox_image"], max_side=self.max_frame_side)
+        }
+
+    def load_image(self, ref: str):
+        """Load a stored image as an OpenCV array, or None if missing"""
+        path = self.find(ref)
+        if path is None:
+            return None
+        return cv2.imread(path)
+
+# Initialize evidence store
+evidence_store = EvidenceStore()
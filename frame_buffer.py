@@ -0,0 +1,141 @@
+import multiprocessing as mp
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+class SharedFrameRing:
+    """Ring of fixed-size shared memory slots for passing decoded frames between processes.
+
+    The decoder copies each frame into a free slot and only sends a small metadata
+    dict (slot index, shape, dtype) through a queue. Inference workers read the slot
+    as a zero-copy NumPy view and release it when done.
+
+    The ring must be handed to workers as a Process argument: the free-slot
+    mp.Queue inside it can only be pickled while a process is being started.
+    """
+
+    def __init__(self, num_slots: int = 8, max_frame_shape: tuple = (1080, 1920, 3),
+                 dtype=np.uint8, name: Optional[str] = None):
+        self.num_slots = num_slots
+        self.max_frame_shape = tuple(max_frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.slot_size = int(np.prod(self.max_frame_shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                              size=self.slot_size * num_slots)
+        self._owner = True
+
+        # Slot indices that are free to be written; shared with workers
+        self.free_slots = mp.Queue(maxsize=num_slots)
+        for slot in range(num_slots):
+            self.free_slots.put(slot)
+        # 1 while a slot holds a frame that has not been released yet
+        self.in_use = mp.Array('b', num_slots)
+
+    def __getstate__(self):
+        # Only the shared memory name travels to child processes
+        return {
+            "num_slots": self.num_slots,
+            "max_frame_shape": self.max_frame_shape,
+            "dtype": self.dtype.str,
+            "slot_size": self.slot_size,
+            "name": self.shm.name,
+            "free_slots": self.free_slots,
+            "in_use": self.in_use
+        }
+
+    def __setstate__(self, state):
+        self.num_slots = state["num_slots"]
+        self.max_frame_shape = state["max_frame_shape"]
+        self.dtype = np.dtype(state["dtype"])
+        self.slot_size = state["slot_size"]
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+        # Under spawn/forkserver, attaching registers the segment with the worker's own
+        # resource tracker, which would unlink it when the worker exits. Forked workers
+        # share the creator's tracker, so their registration must be left alone.
+        if mp.get_start_method() != "fork":
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        self._owner = False
+        self.free_slots = state["free_slots"]
+        self.in_use = state["in_use"]
+
+    def _slot_buffer(self, slot: int):
+        """Raw memoryview over a single slot"""
+        if not 0 <= slot < self.num_slots:
+            raise ValueError(f"Invalid slot index: {slot}")
+        start = slot * self.slot_size
+        return self.shm.buf[start:start + self.slot_size]
+
+    def write(self, frame: np.ndarray, timeout: Optional[float] = None, **metadata) -> Dict:
+        """
+        Copy a frame into the next free slot
+        Returns: metadata dict to send through a queue instead of the frame
+        """
+        if frame.dtype != self.dtype:
+            raise ValueError(f"Frame dtype {frame.dtype} does not match ring dtype {self.dtype}")
+        if frame.nbytes > self.slot_size:
+            raise ValueError(f"Frame of shape {frame.shape} does not fit in a ring slot")
+
+        # Blocks until a worker releases a slot (back-pressure on the decoder)
+        slot = self.free_slots.get(timeout=timeout)
+        self.in_use[slot] = 1
+        slot_view = np.ndarray(frame.shape, dtype=self.dtype, buffer=self._slot_buffer(slot))
+        slot_view[...] = frame
+
+        frame_ref = {
+            "slot": slot,
+            "shape": tuple(frame.shape),
+            "dtype": self.dtype.str,
+            "timestamp": time.time()
+        }
+        frame_ref.update(metadata)
+        return frame_ref
+
+    def validate(self, frame_ref: Dict):
+        """Raise ValueError if frame_ref does not describe a frame that fits in a slot"""
+        try:
+            slot = frame_ref["slot"]
+            shape = tuple(frame_ref["shape"])
+            dtype = np.dtype(frame_ref["dtype"])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid frame reference: {e}")
+        if not isinstance(slot, int) or not 0 <= slot < self.num_slots:
+            raise ValueError(f"Invalid slot index: {slot}")
+        if int(np.prod(shape)) * dtype.itemsize > self.slot_size:
+            raise ValueError(f"Frame of shape {shape} does not fit in a ring slot")
+
+    def read(self, frame_ref: Dict) -> np.ndarray:
+        """
+        Get a zero-copy view of the frame described by frame_ref
+        The view is only valid until the slot is released
+        """
+        self.validate(frame_ref)
+        return np.ndarray(tuple(frame_ref["shape"]), dtype=np.dtype(frame_ref["dtype"]),
+                          buffer=self._slot_buffer(frame_ref["slot"]))
+
+    def release(self, frame_ref: Dict):
+        """
+        Hand the slot back to the decoder for reuse
+        Raises ValueError if the slot is already free, so it is never queued twice
+        """
+        slot = frame_ref["slot"]
+        if not isinstance(slot, int) or not 0 <= slot < self.num_slots:
+            raise ValueError(f"Invalid slot index: {slot}")
+        with self.in_use.get_lock():
+            if not self.in_use[slot]:
+                raise ValueError(f"Slot {slot} is already free")
+            self.in_use[slot] = 0
+        self.free_slots.put(slot)
+
+    def close(self):
+        """Detach from the shared memory block; the creating process also unlinks it"""
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,109 @@
+from typing import Dict, Optional
+
+import cv2
+
+class MotionGate:
+    """Cheap pre-filter that skips plate detection on static frames.
+
+    Each frame is downscaled, converted to grayscale and compared with the previous
+    one (or a MOG2 background model) inside a region of interest. Detection should
+    only run when enough pixels changed.
+    """
+
+    def __init__(self, roi: Optional[tuple] = None, method: str = "diff", downscale_width: int = 320,
+                 pixel_threshold: int = 25, min_changed_fraction: float = 0.01,
+                 max_skipped_frames: Optional[int] = None):
+        """
+        roi: (x, y, width, height) as fractions of the frame, e.g. (0, 0.5, 1, 0.5)
+             for the bottom half; None means the whole frame
+        max_skipped_frames: force a detection after this many consecutive skips
+        """
+        if method not in ("diff", "mog2"):
+            raise ValueError("method must be 'diff' or 'mog2'")
+        if roi is not None:
+            if len(roi) != 4:
+                raise ValueError("roi must be (x, y, width, height)")
+            x, y, roi_w, roi_h = roi
+            if not (0 <= x < 1 and 0 <= y < 1 and roi_w > 0 and roi_h > 0
+                    and x + roi_w <= 1 and y + roi_h <= 1):
+                raise ValueError("roi must be fractions in [0, 1] with positive width and height inside the frame")
+        self.roi = roi
+        self.method = method
+        self.downscale_width = downscale_width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_fraction = min_changed_fraction
+        self.max_skipped_frames = max_skipped_frames
+
+        self.previous = None
+        self.background = cv2.createBackgroundSubtractorMOG2(detectShadows=False) if method == "mog2" else None
+        self.consecutive_skips = 0
+        self.skipped = 0
+        self.passed = 0
+
+    def _prepare(self, frame):
+        """Crop to ROI, downscale, grayscale and blur"""
+        height, width = frame.shape[:2]
+        if self.roi:
+            x, y, roi_w, roi_h = self.roi
+            x1, y1 = int(x * width), int(y * height)
+            x2, y2 = int((x + roi_w) * width), int((y + roi_h) * height)
+            frame = frame[y1:y2, x1:x2]
+            height, width = frame.shape[:2]
+            if height == 0 or width == 0:
+                raise ValueError("Region of interest is empty for this frame size")
+
+        if width > self.downscale_width:
+            scaled_height = max(1, int(height * self.downscale_width / width))
+            frame = cv2.resize(frame, (self.downscale_width, scaled_height), interpolation=cv2.INTER_AREA)
+
+        if len(frame.shape) == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(frame, (5, 5), 0)
+
+    def changed_fraction(self, frame) -> float:
+        """Fraction of ROI pixels that changed since the previous frame"""
+        small = self._prepare(frame)
+
+        if self.method == "mog2":
+            mask = self.background.apply(small)
+        else:
+            if self.previous is None or self.previous.shape != small.shape:
+                self.previous = small
+                return 1.0
+            diff = cv2.absdiff(small, self.previous)
+            self.previous = small
+            _, mask = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+
+        return cv2.countNonZero(mask) / mask.size
+
+    def should_detect(self, frame) -> bool:
+        """Decide whether detection should run on this frame and update the counters"""
+        moved = self.changed_fraction(frame) >= self.min_changed_fraction
+        forced = self.max_skipped_frames is not None and self.consecutive_skips >= self.max_skipped_frames
+
+        if moved or forced:
+            self.consecutive_skips = 0
+            self.passed += 1
+            return True
+
+        self.consecutive_skips += 1
+        self.skipped += 1
+        return False
+
+    def stats(self) -> Dict:
+        """Skip and pass counts since creation or the last reset"""
+        total = self.skipped + self.passed
+        return {
+            "skipped": self.skipped,
+            "passed": self.passed,
+            "skip_ratio": self.skipped / total if total else 0.0
+        }
+
+    def reset(self):
+        """Forget the reference frame and counters"""
+        self.previous = None
+        if self.method == "mog2":
+            self.background = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+        self.consecutive_skips = 0
+        self.skipped = 0
+        self.passed = 0
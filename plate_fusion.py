@@ -0,0 +1,229 @@
+import re
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional
+
+# Registration state / union territory codes
+INDIAN_STATE_CODES = {
+    "AN", "AP", "AR", "AS", "BR", "CG", "CH", "DD", "DL", "DN", "GA", "GJ", "HP", "HR",
+    "JH", "JK", "KA", "KL", "LA", "LD", "MH", "ML", "MN", "MP", "MZ", "NL", "OD", "OR",
+    "PB", "PY", "RJ", "SK", "TN", "TR", "TS", "UK", "UP", "WB"
+}
+
+# e.g. MH12AB1234, DL3CAF0001, KA011234
+STANDARD_PLATE_PATTERN = re.compile(r'^([A-Z]{2})([0-9]{1,2})([A-Z]{0,3})([0-9]{4})$')
+# Bharat series, e.g. 22BH1234AB
+BH_PLATE_PATTERN = re.compile(r'^[0-9]{2}BH[0-9]{4}[A-Z]{1,2}$')
+
+# Common OCR confusions, applied only where the format requires the other class
+TO_DIGIT = {'O': '0', 'D': '0', 'Q': '0', 'I': '1', 'L': '1', 'Z': '2', 'S': '5', 'B': '8', 'G': '6', 'T': '7'}
+TO_LETTER = {'0': 'O', '1': 'I', '2': 'Z', '4': 'A', '5': 'S', '6': 'G', '7': 'T', '8': 'B'}
+
+# Reads needing more swaps than this are too far from any format to correct safely
+MAX_SUBSTITUTIONS = 2
+
+# Floor for character confidences, so reads that are all 0.0 still get a vote
+MIN_CONFIDENCE = 1e-3
+
+# Text printed on high security plates that is not part of the number
+NOISE_FRAGMENTS = {"IND"}
+
+def clean_plate_text(text: str) -> str:
+    """Uppercase and keep only letters and digits"""
+    return re.sub(r'[^A-Z0-9]', '', text.upper())
+
+def merge_fragments(ocr_results: list) -> tuple:
+    """
+    Merge EasyOCR (bbox, text, confidence) fragments in reading order
+    Fragments are grouped into lines top to bottom, then read left to right
+    Returns: (merged_text, per_character_confidences)
+    """
+    fragments = []
+    for bbox, text, confidence in ocr_results:
+        cleaned = clean_plate_text(text)
+        if not cleaned or cleaned in NOISE_FRAGMENTS:
+            continue
+        ys = [point[1] for point in bbox]
+        xs = [point[0] for point in bbox]
+        fragments.append({
+            "text": cleaned,
+            "confidence": float(confidence),
+            "y_min": min(ys),
+            "y_max": max(ys),
+            "y_center": (min(ys) + max(ys)) / 2,
+            "x_min": min(xs)
+        })
+
+    # A fragment joins the current line if its vertical centre falls inside it
+    lines = []
+    for fragment in sorted(fragments, key=lambda f: f["y_center"]):
+        if lines and lines[-1]["y_min"] <= fragment["y_center"] <= lines[-1]["y_max"]:
+            line = lines[-1]
+            line["fragments"].append(fragment)
+            line["y_min"] = min(line["y_min"], fragment["y_min"])
+            line["y_max"] = max(line["y_max"], fragment["y_max"])
+        else:
+            lines.append({"y_min": fragment["y_min"], "y_max": fragment["y_max"], "fragments": [fragment]})
+
+    text = ""
+    confidences = []
+    for line in lines:
+        for fragment in sorted(line["fragments"], key=lambda f: f["x_min"]):
+            text += fragment["text"]
+            confidences.extend([fragment["confidence"]] * len(fragment["text"]))
+    return text, confidences
+
+def is_valid_indian_plate(text: str) -> bool:
+    """Check text against the standard and BH series plate formats"""
+    if BH_PLATE_PATTERN.match(text):
+        return True
+    match = STANDARD_PLATE_PATTERN.match(text)
+    return bool(match) and match.group(1) in INDIAN_STATE_CODES
+
+def _coerce(text: str, template: str) -> Optional[tuple]:
+    """
+    Force each character to the class in template ('L' letter, 'D' digit, other literal)
+    Returns: (coerced_text, substitutions) or None if a character cannot be coerced
+    """
+    chars = []
+    substitutions = 0
+    for char, kind in zip(text, template):
+        if kind == 'L' and not char.isalpha():
+            char, substitutions = TO_LETTER.get(char), substitutions + 1
+        elif kind == 'D' and not char.isdigit():
+            char, substitutions = TO_DIGIT.get(char), substitutions + 1
+        elif kind not in ('L', 'D') and char != kind:
+            return None
+        if char is None:
+            return None
+        chars.append(char)
+    return "".join(chars), substitutions
+
+def _templates(length: int) -> List[str]:
+    """
+    Plate templates of the given length that substitutions may be applied to
+    Short forms (one district digit or fewer than two series letters) are left out:
+    a truncated full plate also fits them, and coercing it would invent a different plate
+    """
+    templates = []
+    for series_letters in (2, 3):
+        if length == 2 + 2 + series_letters + 4:
+            templates.append("LLDD" + "L" * series_letters + "DDDD")
+    for series_letters in (1, 2):
+        if length == 8 + series_letters:
+            templates.append("DDBHDDDD" + "L" * series_letters)
+    return templates
+
+def normalize_plate(text: str) -> tuple:
+    """
+    Fix letter/digit confusions so the text matches an Indian plate format
+    Returns: (plate, is_valid); the cleaned input is returned with is_valid False
+    if no full-length template fits within MAX_SUBSTITUTIONS swaps, or if a long read
+    looks like a valid plate with one extra leading or trailing character
+    """
+    text = clean_plate_text(text)
+    if is_valid_indian_plate(text):
+        return text, True
+
+    # Longer than the common 10 character form: e.g. MH12AB12345 is MH12AB1234
+    # plus noise, not MH12ABI2345
+    if len(text) > 10 and (is_valid_indian_plate(text[1:]) or is_valid_indian_plate(text[:-1])):
+        return text, False
+
+    best = None
+    for template in _templates(len(text)):
+        coerced = _coerce(text, template)
+        if coerced and coerced[1] <= MAX_SUBSTITUTIONS and is_valid_indian_plate(coerced[0]):
+            if best is None or coerced[1] < best[1]:
+                best = coerced
+    return (best[0], True) if best else (text, False)
+
+class PlateVoter:
+    """Combine several reads of the same plate by confidence-weighted character voting.
+
+    Reads are collected per key (a tracker id for video). Only reads of the most
+    supported length take part, and each position keeps the character with the
+    highest summed confidence. Keys that have not been read for max_idle_seconds, or
+    beyond the max_keys most recently read, are dropped so long streams stay bounded.
+    """
+
+    def __init__(self, max_reads: int = 15, max_keys: int = 1000, max_idle_seconds: float = 60.0):
+        self.max_reads = max_reads
+        self.max_keys = max_keys
+        self.max_idle_seconds = max_idle_seconds
+        self.reads = OrderedDict()  # key -> [(text, confidences)], least recently read first
+        self.last_seen = {}  # key -> time of the latest read
+
+    def _expire(self, now: float):
+        """Drop least recently read keys that are idle or over the key limit"""
+        while self.reads:
+            oldest = next(iter(self.reads))
+            if len(self.reads) <= self.max_keys and now - self.last_seen[oldest] <= self.max_idle_seconds:
+                break
+            self.clear(oldest)
+
+    def add_read(self, key, text: str, confidences: Optional[List[float]] = None):
+        """
+        Record one read; confidences default to 1.0 per character
+        Raises ValueError if confidences does not have one entry per character
+        """
+        if not text:
+            return
+        if confidences is None:
+            confidences = [1.0] * len(text)
+        if len(confidences) != len(text):
+            raise ValueError(f"Got {len(confidences)} confidences for {len(text)} characters")
+        confidences = [max(float(confidence), MIN_CONFIDENCE) for confidence in confidences]
+
+        now = time.monotonic()
+        reads = self.reads.setdefault(key, [])
+        self.reads.move_to_end(key)
+        self.last_seen[key] = now
+        reads.append((text, confidences))
+        # Keep the most recent reads only
+        if len(reads) > self.max_reads:
+            del reads[0]
+        self._expire(now)
+
+    def vote(self, key) -> Optional[Dict]:
+        """
+        Fuse all reads for key
+        Returns: dict with number_plate, confidence, num_reads and is_valid, or None
+        """
+        reads = self.reads.get(key)
+        if not reads:
+            return None
+
+        # Pick the length with the most total confidence behind it
+        length_weight = defaultdict(float)
+        for text, confidences in reads:
+            length_weight[len(text)] += sum(confidences) / len(confidences)
+        length = max(length_weight, key=length_weight.get)
+
+        fused = ""
+        position_confidences = []
+        for position in range(length):
+            weights = defaultdict(float)
+            for text, confidences in reads:
+                if len(text) == length:
+                    weights[text[position]] += confidences[position]
+            char = max(weights, key=weights.get)
+            fused += char
+            position_confidences.append(weights[char] / sum(weights.values()))
+
+        number_plate, is_valid = normalize_plate(fused)
+        return {
+            "number_plate": number_plate,
+            "confidence": min(position_confidences),
+            "num_reads": len(reads),
+            "is_valid": is_valid
+        }
+
+    def clear(self, key=None):
+        """Forget reads for one key (e.g. when its track ends), or all keys"""
+        if key is None:
+            self.reads.clear()
+            self.last_seen.clear()
+        else:
+            self.reads.pop(key, None)
+            self.last_seen.pop(key, None)
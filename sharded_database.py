@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class ShardedDatabaseManager:
+    """JSON database with vehicles partitioned into shard files.
+
+    Shards are loaded on first access and at most max_resident_shards are kept in
+    memory (least recently used are dropped). Every write is saved immediately, so
+    evicting a shard never loses data. A single lock serialises shard loading,
+    mutation and writing, since Streamlit sessions run on separate threads.
+    """
+
+    def __init__(self, data_dir: str = "speedolic_shards", shard_by: str = "hash",
+                 num_shards: int = 64, max_resident_shards: int = 8):
+        if shard_by not in ("hash", "state"):
+            raise ValueError("shard_by must be 'hash' or 'state'")
+        self.data_dir = data_dir
+        self.shard_by = shard_by
+        self.num_shards = num_shards
+        self.max_resident_shards = max_resident_shards
+        self.users_file = os.path.join(data_dir, "users.json")
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        self._users = None  # Loaded on first access
+        self._shards = OrderedDict()  # shard key -> {number_plate: vehicle}
+        self._lock = threading.RLock()
+
+    def _read_json(self, path: str, default):
+        """Load a JSON file, returning default if missing or unreadable"""
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                pass
+        return default
+
+    def _write_json(self, path: str, data):
+        """Atomically save data to a JSON file"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    @property
+    def users(self) -> List[Dict]:
+        with self._lock:
+            if self._users is None:
+                self._users = self._read_json(self.users_file, [])
+            return self._users
+
+    def _shard_key(self, clean_plate: str) -> str:
+        """Pick the shard for a plate: crc32 bucket or two-letter state code"""
+        if self.shard_by == "state":
+            state_code = clean_plate[:2].upper()
+            return state_code if state_code.isalpha() and len(state_code) == 2 else "XX"
+        return f"{zlib.crc32(clean_plate.encode()) % self.num_shards:03d}"
+
+    def _shard_path(self, shard_key: str) -> str:
+        return os.path.join(self.data_dir, f"vehicles_{shard_key}.json")
+
+    def _shard_keys(self) -> List[str]:
+        """All shard keys present on disk"""
+        keys = []
+        for filename in sorted(os.listdir(self.data_dir)):
+            if filename.startswith("vehicles_") and filename.endswith(".json"):
+                keys.append(filename[len("vehicles_"):-len(".json")])
+        return keys
+
+    def _get_shard(self, shard_key: str) -> Dict:
+        """Return a resident shard, loading it and evicting the oldest if needed"""
+        with self._lock:
+            if shard_key in self._shards:
+                self._shards.move_to_end(shard_key)
+                return self._shards[shard_key]
+
+            shard = self._read_json(self._shard_path(shard_key), {})
+            self._shards[shard_key] = shard
+            while len(self._shards) > self.max_resident_shards:
+                self._shards.popitem(last=False)
+            return shard
+
+    def create_user(self, username: str, password: str, user_type: str) -> bool:
+        """Create a new user with specified type (viewer or uploader)"""
+        with self._lock:
+            if self.get_user_by_username(username):
+                return False
+
+            user_doc = {
+                "username": username,
+                "password": password,  # In production, hash this
+                "user_type": user_type,  # "viewer" or "uploader"
+                "created_at": datetime.now()
+            }
+
+            self.users.append(user_doc)
+            self._write_json(self.users_file, self.users)
+            return True
+
+    def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
+        """Authenticate user and return user document"""
+        user = self.get_user_by_username(username)
+        if user and user["password"] == password:
+            return user
+        return None
+
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
+        """Get user by username"""
+        for user in self.users:
+            if user["username"] == username:
+                return user
+        return None
+
+    def add_vehicle_complaint(self, number_plate: str, complaint: str, evidence: Optional[Dict] = None) -> bool:
+        """Add a complaint to a vehicle's record, optionally with evidence hash references"""
+        # Remove spaces from number plate
+        clean_plate = number_plate.replace(" ", "")
+        shard_key = self._shard_key(clean_plate)
+
+        complaint_doc = {
+            "complaint": complaint,
+            "timestamp": datetime.now()
+        }
+        if evidence:
+            complaint_doc["evidence"] = evidence
+
+        # Held across load, mutation and write so no session works on a stale copy
+        with self._lock:
+            shard = self._get_shard(shard_key)
+
+            vehicle = shard.get(clean_plate)
+            if vehicle is None:
+                # Create new vehicle record
+                vehicle = {
+                    "number_plate": clean_plate,
+                    "created_at": datetime.now(),
+                    "complaints": []
+                }
+                shard[clean_plate] = vehicle
+            vehicle["complaints"].append(complaint_doc)
+
+            # Only the touched shard is rewritten
+            self._write_json(self._shard_path(shard_key), shard)
+        return True
+
+    def get_vehicle_complaints(self, number_plate: str) -> Optional[Dict]:
+        """Get all complaints for a vehicle"""
+        clean_plate = number_plate.replace(" ", "")
+        return self._get_shard(self._shard_key(clean_plate)).get(clean_plate)
+
+    def get_all_vehicles(self) -> List[Dict]:
+        """Get all vehicles with their complaints (reads every shard)"""
+        vehicles = []
+        with self._lock:
+            for shard_key in self._shard_keys():
+                vehicles.extend(self._get_shard(shard_key).values())
+        return vehicles
+
+    def get_all_users(self) -> List[Dict]:
+        """Get all users"""
+        return self.users
+
+    def import_simple_database(self, data_file: str = "speedolic_data.json") -> int:
+        """
+        Merge an existing SimpleDatabaseManager JSON file into the shards
+        Complaints already present (same timestamp and text) are skipped,
+        so importing the same file twice is harmless
+        Returns: number of complaints actually added
+        """
+        data = self._read_json(data_file, {"users": [], "vehicles": []})
+
+        # Group first so each shard file is written once
+        grouped = {}
+        for vehicle in data.get("vehicles", []):
+            grouped.setdefault(self._shard_key(vehicle["number_plate"]), []).append(vehicle)
+
+        added = 0
+        with self._lock:
+            for user in data.get("users", []):
+                if not self.get_user_by_username(user["username"]):
+                    self.users.append(user)
+            self._write_json(self.users_file, self.users)
+
+            for shard_key, vehicles in grouped.items():
+                shard = self._get_shard(shard_key)
+                for vehicle in vehicles:
+                    existing = shard.setdefault(vehicle["number_plate"], {
+                        "number_plate": vehicle["number_plate"],
+                        "created_at": vehicle.get("created_at", datetime.now()),
+                        "complaints": []
+                    })
+                    # Timestamps compared as strings, the form they take once saved
+                    seen = {(str(c["timestamp"]), c["complaint"]) for c in existing["complaints"]}
+                    for complaint in vehicle.get("complaints", []):
+                        key = (str(complaint["timestamp"]), complaint["complaint"])
+                        if key not in seen:
+                            existing["complaints"].append(complaint)
+                            seen.add(key)
+                            added += 1
+                self._write_json(self._shard_path(shard_key), shard)
+
+        return added
+
+# Initialize database manager
+db_manager = ShardedDatabaseManager()
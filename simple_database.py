@@ -55,8 +55,8 @@ class SimpleDatabaseManager:
                 return user
         return None
     
-    def add_vehicle_complaint(self, number_plate: str, complaint: str) -> bool:
-        """Add a complaint to a vehicle's record"""
+    def add_vehicle_complaint(self, number_plate: str, complaint: str, evidence: Optional[Dict] = None) -> bool:
+        """Add a complaint to a vehicle's record, optionally with evidence hash references"""
         # Remove spaces from number plate
         clean_plate = number_plate.replace(" ", "")
         
@@ -81,6 +81,8 @@ class SimpleDatabaseManager:
             "complaint": complaint,
             "timestamp": datetime.now()
         }
+        if evidence:
+            complaint_doc["evidence"] = evidence
         vehicle["complaints"].append(complaint_doc)
         
         self._save_data()
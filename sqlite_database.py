@@ -0,0 +1,215 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    user_type TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vehicles (
+    id INTEGER PRIMARY KEY,
+    number_plate TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS complaints (
+    id INTEGER PRIMARY KEY,
+    vehicle_id INTEGER NOT NULL REFERENCES vehicles(id),
+    complaint TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    evidence TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_complaints_vehicle ON complaints(vehicle_id);
+"""
+
+class SQLiteDatabaseManager:
+    """SQLite backend with the same method set as SimpleDatabaseManager.
+
+    The database runs in WAL mode so readers do not block the writer, and each
+    thread (Streamlit session) gets its own connection.
+    """
+
+    def __init__(self, db_path: str = "speedolic.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly in transaction()
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements in one write transaction"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except:
+            # Also covers a failed COMMIT (e.g. SQLITE_BUSY), so the thread's
+            # connection is never left inside an open transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def _user_doc(self, row: sqlite3.Row, include_password: bool = True) -> Dict:
+        user = {
+            "username": row["username"],
+            "user_type": row["user_type"],
+            "created_at": datetime.fromisoformat(row["created_at"])
+        }
+        if include_password:
+            user["password"] = row["password"]
+        return user
+
+    def _complaint_doc(self, row: sqlite3.Row) -> Dict:
+        complaint = {
+            "complaint": row["complaint"],
+            "timestamp": datetime.fromisoformat(row["timestamp"])
+        }
+        if row["evidence"]:
+            complaint["evidence"] = json.loads(row["evidence"])
+        return complaint
+
+    def create_user(self, username: str, password: str, user_type: str) -> bool:
+        """Create a new user with specified type (viewer or uploader)"""
+        try:
+            with self.transaction() as conn:
+                conn.execute(
+                    "INSERT INTO users (username, password, user_type, created_at) VALUES (?, ?, ?, ?)",
+                    (username, password, user_type, datetime.now().isoformat())  # In production, hash password
+                )
+        except sqlite3.IntegrityError:
+            # Username already exists
+            return False
+        return True
+
+    def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
+        """Authenticate user and return user document"""
+        user = self.get_user_by_username(username)
+        if user and user["password"] == password:
+            return user
+        return None
+
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
+        """Get user by username"""
+        row = self._connect().execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+        return self._user_doc(row) if row else None
+
+    def _insert_complaint(self, conn: sqlite3.Connection, number_plate: str, complaint: str,
+                          evidence: Optional[Dict] = None):
+        """Insert a complaint, creating the vehicle row if needed"""
+        # Remove spaces from number plate
+        clean_plate = number_plate.replace(" ", "")
+        now = datetime.now().isoformat()
+        conn.execute("INSERT OR IGNORE INTO vehicles (number_plate, created_at) VALUES (?, ?)",
+                     (clean_plate, now))
+        conn.execute(
+            "INSERT INTO complaints (vehicle_id, complaint, timestamp, evidence) "
+            "SELECT id, ?, ?, ? FROM vehicles WHERE number_plate = ?",
+            (complaint, now, json.dumps(evidence) if evidence else None, clean_plate)
+        )
+
+    def add_vehicle_complaint(self, number_plate: str, complaint: str, evidence: Optional[Dict] = None) -> bool:
+        """Add a complaint to a vehicle's record, optionally with evidence hash references"""
+        with self.transaction() as conn:
+            self._insert_complaint(conn, number_plate, complaint, evidence)
+        return True
+
+    def add_vehicle_complaints(self, complaints: List[tuple]) -> int:
+        """
+        Add many (number_plate, complaint[, evidence]) entries in a single transaction
+        Returns: number of complaints added
+        """
+        with self.transaction() as conn:
+            for entry in complaints:
+                self._insert_complaint(conn, *entry)
+        return len(complaints)
+
+    def get_vehicle_complaints(self, number_plate: str) -> Optional[Dict]:
+        """Get all complaints for a vehicle"""
+        clean_plate = number_plate.replace(" ", "")
+        conn = self._connect()
+        vehicle = conn.execute("SELECT * FROM vehicles WHERE number_plate = ?", (clean_plate,)).fetchone()
+        if vehicle is None:
+            return None
+
+        rows = conn.execute("SELECT * FROM complaints WHERE vehicle_id = ? ORDER BY id", (vehicle["id"],))
+        return {
+            "number_plate": vehicle["number_plate"],
+            "created_at": datetime.fromisoformat(vehicle["created_at"]),
+            "complaints": [self._complaint_doc(row) for row in rows]
+        }
+
+    def get_all_vehicles(self) -> List[Dict]:
+        """Get all vehicles with their complaints"""
+        conn = self._connect()
+        vehicles = {}
+        for row in conn.execute("SELECT * FROM vehicles ORDER BY id"):
+            vehicles[row["id"]] = {
+                "number_plate": row["number_plate"],
+                "created_at": datetime.fromisoformat(row["created_at"]),
+                "complaints": []
+            }
+        # One pass over complaints instead of a query per vehicle
+        for row in conn.execute("SELECT * FROM complaints ORDER BY id"):
+            if row["vehicle_id"] in vehicles:
+                vehicles[row["vehicle_id"]]["complaints"].append(self._complaint_doc(row))
+        return list(vehicles.values())
+
+    def get_all_users(self) -> List[Dict]:
+        """Get all users"""
+        rows = self._connect().execute("SELECT * FROM users ORDER BY id")
+        return [self._user_doc(row, include_password=False) for row in rows]  # Exclude password
+
+    def import_simple_database(self, data_file: str = "speedolic_data.json") -> int:
+        """
+        Copy users and complaints from a SimpleDatabaseManager JSON file in one transaction
+        Complaints already present (same vehicle, timestamp and text) are skipped,
+        so importing the same file twice is harmless
+        Returns: number of complaints actually inserted
+        """
+        with open(data_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        imported = 0
+        with self.transaction() as conn:
+            for user in data.get("users", []):
+                conn.execute(
+                    "INSERT OR IGNORE INTO users (username, password, user_type, created_at) VALUES (?, ?, ?, ?)",
+                    (user["username"], user["password"], user["user_type"], str(user["created_at"]))
+                )
+            for vehicle in data.get("vehicles", []):
+                conn.execute("INSERT OR IGNORE INTO vehicles (number_plate, created_at) VALUES (?, ?)",
+                             (vehicle["number_plate"], str(vehicle["created_at"])))
+                for complaint in vehicle.get("complaints", []):
+                    cursor = conn.execute(
+                        "INSERT INTO complaints (vehicle_id, complaint, timestamp, evidence) "
+                        "SELECT v.id, ?, ?, ? FROM vehicles v WHERE v.number_plate = ? "
+                        "AND NOT EXISTS (SELECT 1 FROM complaints c WHERE c.vehicle_id = v.id "
+                        "AND c.timestamp = ? AND c.complaint = ?)",
+                        (complaint["complaint"], str(complaint["timestamp"]),
+                         json.dumps(complaint["evidence"]) if complaint.get("evidence") else None,
+                         vehicle["number_plate"], str(complaint["timestamp"]), complaint["complaint"])
+                    )
+                    imported += cursor.rowcount
+        return imported
+
+# Initialize database manager
+db_manager = SQLiteDatabaseManager()
@@ -0,0 +1,62 @@
+import pytest
+
+from plate_fusion import PlateVoter, merge_fragments, normalize_plate
+
+def _box(x1, y1, x2, y2):
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+def test_merge_fragments_reads_two_line_plate_in_order():
+    results = [
+        (_box(0, 30, 50, 50), "AB 1234", 0.8),
+        (_box(0, 0, 40, 20), "MH12", 0.9),
+        (_box(60, 0, 80, 20), "IND", 0.5),
+    ]
+    text, confidences = merge_fragments(results)
+    assert text == "MH12AB1234"
+    assert confidences == [0.9] * 4 + [0.8] * 6
+
+@pytest.mark.parametrize("raw, expected", [
+    ("MH12AB1234", ("MH12AB1234", True)),
+    ("MHI2AB1234", ("MH12AB1234", True)),
+    ("MH12A81234", ("MH12AB1234", True)),
+    ("22BH1234AB", ("22BH1234AB", True)),
+])
+def test_normalize_plate_fixes_confusions(raw, expected):
+    assert normalize_plate(raw) == expected
+
+@pytest.mark.parametrize("raw", [
+    "MH12AB123",     # truncated
+    "MH12AB12345",   # one extra trailing character
+    "MH12AB12341",
+    "M412AB1234",    # unknown state code
+])
+def test_normalize_plate_does_not_invent_plates(raw):
+    assert normalize_plate(raw) == (raw, False)
+
+def test_voter_prefers_confident_characters():
+    voter = PlateVoter()
+    voter.add_read("track", "MH12AB1234", [0.9] * 10)
+    voter.add_read("track", "MH12A81234", [0.6] * 10)
+    voter.add_read("track", "MH12AB1Z34", [0.5] * 10)
+    result = voter.vote("track")
+    assert result["number_plate"] == "MH12AB1234"
+    assert result["num_reads"] == 3
+    assert result["is_valid"]
+
+def test_voter_rejects_mismatched_confidences():
+    voter = PlateVoter()
+    with pytest.raises(ValueError):
+        voter.add_read("track", "ABC", [0.5])
+    assert voter.vote("track") is None
+
+def test_voter_handles_zero_confidence_reads():
+    voter = PlateVoter()
+    voter.add_read("track", "AB", [0.0, 0.0])
+    assert voter.vote("track")["number_plate"] == "AB"
+
+def test_voter_drops_least_recently_read_keys():
+    voter = PlateVoter(max_keys=2)
+    for key in range(3):
+        voter.add_read(key, "MH12AB1234")
+    assert list(voter.reads) == [1, 2]
+    assert voter.vote(0) is None
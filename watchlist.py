@@ -0,0 +1,170 @@
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class Watchlist:
+    """In-memory index of every plate that has complaints.
+
+    A Bloom filter rejects almost all unknown plates before the exact lookup in a
+    dict of plate -> complaint count. Matches are turned into alert events that are
+    passed to subscribers and kept in a short history. A plate seen again on the
+    same track (or source) within alert_cooldown_seconds does not raise a new alert,
+    so one vehicle in a 30 fps feed produces one alert rather than one per frame.
+    """
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.001, max_alerts: int = 100,
+                 alert_cooldown_seconds: float = 30.0):
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.complaint_counts = {}  # clean plate -> number of complaints
+        self.subscribers = []
+        self.recent_alerts = deque(maxlen=max_alerts)
+        self.alert_cooldown_seconds = alert_cooldown_seconds
+        self.last_alerted = {}  # (clean plate, track or source) -> time of last alert
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clean_plate(number_plate: str) -> str:
+        return number_plate.replace(" ", "").upper()
+
+    def add(self, number_plate: str, complaints: int = 1):
+        """Add a plate, or bump its complaint count if already listed"""
+        clean_plate = self._clean_plate(number_plate)
+        with self._lock:
+            if clean_plate not in self.complaint_counts:
+                if self.bloom.count >= self.bloom.capacity:
+                    self._grow()
+                self.bloom.add(clean_plate)
+                self.complaint_counts[clean_plate] = 0
+            self.complaint_counts[clean_plate] += complaints
+
+    def _grow(self):
+        """Rebuild the Bloom filter at double capacity so the error rate holds"""
+        bloom = BloomFilter(self.bloom.capacity * 2, self.error_rate)
+        for clean_plate in self.complaint_counts:
+            bloom.add(clean_plate)
+        self.bloom = bloom
+
+    def load_from(self, db_manager) -> int:
+        """
+        Index every vehicle with complaints from a database manager
+        Returns: number of plates on the watchlist
+        """
+        for vehicle in db_manager.get_all_vehicles():
+            complaints = len(vehicle.get("complaints", []))
+            if complaints:
+                self.add(vehicle["number_plate"], complaints)
+        return len(self.complaint_counts)
+
+    def attach(self, db_manager):
+        """
+        Keep the watchlist updated whenever db_manager adds complaints, through
+        add_vehicle_complaint or the batch add_vehicle_complaints where available
+        """
+        add_vehicle_complaint = db_manager.add_vehicle_complaint
+
+        def add_vehicle_complaint_and_watch(number_plate: str, complaint: str, *args, **kwargs) -> bool:
+            added = add_vehicle_complaint(number_plate, complaint, *args, **kwargs)
+            if added:
+                self.add(number_plate)
+            return added
+
+        db_manager.add_vehicle_complaint = add_vehicle_complaint_and_watch
+
+        add_vehicle_complaints = getattr(db_manager, "add_vehicle_complaints", None)
+        if add_vehicle_complaints is None:
+            return
+
+        def add_vehicle_complaints_and_watch(complaints: list, *args, **kwargs) -> int:
+            added = add_vehicle_complaints(complaints, *args, **kwargs)
+            # The batch runs in one transaction, so either all entries were added or none
+            for entry in complaints:
+                self.add(entry[0])
+            return added
+
+        db_manager.add_vehicle_complaints = add_vehicle_complaints_and_watch
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Register a function called with each alert event"""
+        self.subscribers.append(callback)
+
+    def __contains__(self, number_plate: str) -> bool:
+        clean_plate = self._clean_plate(number_plate)
+        return clean_plate in self.bloom and clean_plate in self.complaint_counts
+
+    def _in_cooldown(self, dedupe_key: tuple, now: float) -> bool:
+        """Check and record the last alert time for a (plate, track/source) pair"""
+        with self._lock:
+            last = self.last_alerted.get(dedupe_key)
+            if last is not None and now - last < self.alert_cooldown_seconds:
+                return True
+            self.last_alerted[dedupe_key] = now
+
+            # Forget pairs whose cooldown has passed so the dict stays bounded
+            if len(self.last_alerted) > 2 * self.recent_alerts.maxlen:
+                self.last_alerted = {key: seen for key, seen in self.last_alerted.items()
+                                     if now - seen < self.alert_cooldown_seconds}
+            return False
+
+    def check_read(self, number_plate: str, source: Optional[str] = None, track_id=None) -> Optional[Dict]:
+        """
+        Check an ANPR read against the watchlist
+        Returns: alert event dict if the plate has complaints, otherwise None
+        (also None for a repeat of the same plate and track/source within the cooldown)
+        """
+        if not number_plate or number_plate not in self:
+            return None
+
+        clean_plate = self._clean_plate(number_plate)
+        now = time.time()
+        dedupe_key = (clean_plate, track_id if track_id is not None else source)
+        if self._in_cooldown(dedupe_key, now):
+            return None
+
+        alert = {
+            "number_plate": clean_plate,
+            "complaints": self.complaint_counts.get(clean_plate, 0),
+            "source": source,
+            "track_id": track_id,
+            "timestamp": now
+        }
+        self.recent_alerts.append(alert)
+        for callback in self.subscribers:
+            try:
+                callback(alert)
+            except Exception as e:
+                print(f"❌ Watchlist alert handler failed: {e}")
+        return alert
+
+    def get_recent_alerts(self) -> List[Dict]:
+        """Alerts raised so far, oldest first"""
+        return list(self.recent_alerts)